@@ -21,11 +21,246 @@ Module for all PCI devices related functions.
 """
 
 
+import functools
 import os
 import re
+import subprocess
+import types
+from concurrent.futures import ThreadPoolExecutor
 
 from avocado.utils import genio, process, wait
 
+#: Patterns compiled once at import time, since get_slot_from_sysfs and
+#: get_cfg apply them once per device on hot enumeration paths.
+_SLOT_IBM_RE = re.compile(r"((\w+)[.])+(\w+)-[PC(\d+)-]*C(\d+)")
+_SLOT_OPENPOWER_RE = re.compile(r"(\w+)[\s]*(\w+)(\d*)")
+_PCI_ID_RE = re.compile(r"[0-9a-e]{4}\:[0-9a-e]{2}\:[0-9a-e]{2}\.[0-9a-e]{1}")
+_SUBVENDOR_RE = re.compile(r"([0-9a-e]{8})")
+
+#: lspci memory region line with size suffix, used by get_mask().
+_REGION_MEM_RE = re.compile(r"Region.*Memory at.*\[size=(\d+)([KMGT])\]")
+
+#: Memory size unit suffix to bit shift, used by get_mask().
+_UNIT_SHIFTS = {"K": 10, "M": 20, "G": 30, "T": 40}
+
+#: PCI class ID to sysfs class name, shared by all get_pci_class_name() calls.
+_PCI_CLASS_NAMES = types.MappingProxyType(
+    {
+        "0104": "scsi_host",
+        "0c04": "fc_host",
+        "0200": "net",
+        "0108": "nvme",
+        "0280": "net",
+        "0207": "net",
+        "0c03": "usb",
+    }
+)
+
+#: lsvpd tag to get_vpd() dictionary key, dispatched on in O(1) per line.
+_VPD_KEYS = {
+    "*YL": "slot",
+    "*DS": "pci_id",
+    "*FC": "feature_code",
+    "*CD": "pci_id",
+}
+
+
+class _PciCache:
+    """
+    Caches the parsed output of the lspci invocations used by this module.
+
+    Most accessors here need only a field or two out of the very same
+    lspci output, so each output format is produced by a single lspci
+    run, parsed once, and served from memory afterwards.  The cache
+    must be dropped (see :meth:`invalidate`) whenever the PCI topology
+    changes, e.g. after a bind/unbind or a device rescan.
+    """
+
+    _machine = None
+    _verbose = None
+    _bus = None
+    _fun_index = None
+
+    @staticmethod
+    def _run(cmd):
+        """
+        Runs the given lspci command line, without a shell in between.
+
+        The output is streamed from a pipe and consumed line by line,
+        so the parsers never hold more than one line of a potentially
+        multi-megabyte listing in memory.  A missing or failing lspci
+        behaves like an empty output.
+
+        :return: lines of the command output.
+        :rtype: iterator of str
+        """
+        try:
+            with subprocess.Popen(
+                cmd.split(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            ) as proc:
+                for line in proc.stdout:
+                    yield line.rstrip("\n")
+        except OSError:
+            return
+
+    @staticmethod
+    def _parse_machine(lines):
+        """
+        Parses machine readable records ("lspci -Dnvmm") into a dict.
+
+        :param lines: lines of lspci output, one record per device,
+                      records separated by blank lines.
+        :return: full PCI address as key, property dict as value.
+        :rtype: dict
+        """
+        devices = {}
+        record = None
+        for line in lines:
+            line = line.strip()
+            if not line:
+                record = None
+                continue
+            prop, _, value = line.partition(":")
+            prop = prop.strip()
+            value = value.strip()
+            if prop == "Slot":
+                record = devices.setdefault(value, {})
+            if record is not None:
+                record[prop] = value
+        return devices
+
+    @staticmethod
+    def _parse_blocks(lines):
+        """
+        Parses block formatted lspci output (-vv style) into a dict.
+
+        :param lines: lines of lspci output, one indented block per
+                      device, each headed by the device address.
+        :return: full PCI address as key, list of block lines as value.
+        :rtype: dict
+        """
+        blocks = {}
+        block = None
+        for line in lines:
+            if not line.strip():
+                block = None
+                continue
+            if not line[0].isspace():
+                block = blocks.setdefault(line.split()[0], [])
+            if block is not None:
+                block.append(line)
+        return blocks
+
+    @classmethod
+    def get_all(cls):
+        """
+        Returns properties of all PCI devices, from "lspci -Dnvmm".
+
+        :return: full PCI address as key, property dict as value.
+        :rtype: dict
+        """
+        if cls._machine is None:
+            cls._machine = cls._parse_machine(cls._run("lspci -Dnvmm"))
+        return cls._machine
+
+    @classmethod
+    def get_verbose(cls):
+        """
+        Returns verbose output of all PCI devices, from "lspci -Dkvv".
+
+        :return: full PCI address as key, list of block lines as value.
+        :rtype: dict
+        """
+        if cls._verbose is None:
+            cls._verbose = cls._parse_blocks(cls._run("lspci -Dkvv"))
+        return cls._verbose
+
+    @classmethod
+    def get_bus_view(cls):
+        """
+        Returns bus centric output of all PCI devices, from "lspci -Dbv".
+
+        :return: full PCI address as key, list of block lines as value.
+        :rtype: dict
+        """
+        if cls._bus is None:
+            cls._bus = cls._parse_blocks(cls._run("lspci -Dbv"))
+        return cls._bus
+
+    @classmethod
+    def by_prefix(cls):
+        """
+        Returns an index of non-bridge PCI addresses by address prefix.
+
+        Keys are every leading segment of a full address ("0000",
+        "0000:03", "0000:03:00") plus the full address itself, values
+        are the full addresses below that prefix.
+
+        :return: address prefix as key, list of full addresses as value.
+        :rtype: dict
+        """
+        if cls._fun_index is None:
+            index = {}
+            for address, props in cls.get_all().items():
+                if props.get("Class", "").startswith("06"):
+                    continue
+                for prefix in (address[:4], address[:7], address[:10], address):
+                    index.setdefault(prefix, []).append(address)
+            cls._fun_index = index
+        return cls._fun_index
+
+    @classmethod
+    def matching_addresses(cls, pci_address):
+        """
+        Returns the known full PCI addresses matching a PCI address segment.
+
+        :param pci_address: Any segment of a PCI address (1f, 0000:00:1f, ...)
+        :return: list of full PCI addresses including domain (0000:00:14.0)
+        :rtype: list of str
+        """
+        devices = cls.get_all()
+        if pci_address in devices:
+            return [pci_address]
+        return [addr for addr in devices if pci_address in addr]
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Drops all cached lspci output.
+
+        Must be called whenever the PCI topology may have changed.
+        """
+        cls._machine = None
+        cls._verbose = None
+        cls._bus = None
+        cls._fun_index = None
+        get_pci_prop.cache_clear()
+
+
+def _write_sysfs(path, data):
+    """
+    Writes data to a sysfs attribute through an unbuffered descriptor.
+
+    sysfs attributes expect the value to arrive in a single write, so
+    this bypasses Python's buffered I/O layer and hands the data to
+    the kernel directly.
+
+    :param path: Path of the sysfs attribute.
+    :param data: Value to be written.
+    :raises GenIOError: On write failure
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY)
+        try:
+            os.write(fd, data.encode())
+        finally:
+            os.close(fd)
+    except OSError as details:
+        raise genio.GenIOError(f"The write to {path} failed: {details}") from details
+
 
 def get_domains():
     """
@@ -35,14 +270,7 @@ def get_domains():
     :return: List of PCI domains.
     :rtype: list of str
     """
-    cmd = "lspci -D"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if output:
-        domains = []
-        for line in output.splitlines():
-            domains.append(line.split(":")[0])
-        return list(set(domains))
-    return []
+    return list({address.split(":", 1)[0] for address in _PciCache.get_all()})
 
 
 def get_pci_addresses():
@@ -54,13 +282,12 @@ def get_pci_addresses():
     :rtype: list of str
     """
     addresses = []
-    cmd = "lspci -D"
-    for line in process.run(cmd).stdout_text.splitlines():
-        if not get_pci_prop(line.split()[0], "Class").startswith("06"):
-            addresses.append(line.split()[0])
-    if addresses:
-        return addresses
-    return []
+    with os.scandir("/sys/bus/pci/devices") as entries:
+        for entry in entries:
+            pci_class = genio.read_file(f"{entry.path}/class")
+            if not pci_class.startswith("0x06"):
+                addresses.append(entry.name)
+    return sorted(addresses)
 
 
 def get_num_interfaces_in_pci(dom_pci_address):
@@ -74,16 +301,20 @@ def get_num_interfaces_in_pci(dom_pci_address):
     :return: number of devices in a PCI domain.
     :rtype: int
     """
-    cmd = "ls -l /sys/class/*/ -1"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if output:
-        filt = f"/{dom_pci_address}"
-        count = 0
-        for line in output.splitlines():
-            if filt in line:
-                count += 1
-        return count
-    return 0
+    filt = f"/{dom_pci_address}"
+    count = 0
+    with os.scandir("/sys/class") as classes:
+        for class_dir in classes:
+            if not class_dir.is_dir():
+                continue
+            with os.scandir(class_dir.path) as entries:
+                for entry in entries:
+                    try:
+                        if filt in os.readlink(entry.path):
+                            count += 1
+                    except OSError:
+                        continue
+    return count
 
 
 def get_disks_in_pci_address(pci_address):
@@ -95,9 +326,14 @@ def get_disks_in_pci_address(pci_address):
     :return: list of disks in a PCI address.
     """
     disk_list = []
-    for device in os.listdir("/sys/block"):
-        if pci_address in os.path.realpath(os.path.join("/sys/block", device)):
-            disk_list.append(f"/dev/{device}")
+    with os.scandir("/sys/block") as entries:
+        for entry in entries:
+            try:
+                target = os.readlink(entry.path)
+            except OSError:
+                continue
+            if pci_address in target:
+                disk_list.append(f"/dev/{entry.name}")
     return disk_list
 
 
@@ -129,10 +365,10 @@ def get_interfaces_in_pci_address(pci_address, pci_class):
     ifaces = []
     if not os.path.isdir(pci_class_path):
         raise ValueError("Please provide valid class name")
-    for interface in os.listdir(pci_class_path):
-        pci_path = os.path.join(pci_class_path, interface)
-        if os.path.isdir(pci_path) and pci_address in os.readlink(pci_path):
-            ifaces.append(interface)
+    with os.scandir(pci_class_path) as entries:
+        for entry in entries:
+            if entry.is_dir() and pci_address in os.readlink(entry.path):
+                ifaces.append(entry.name)
     return ifaces
 
 
@@ -147,26 +383,18 @@ def get_pci_class_name(pci_address):
 
     :return: class name for corresponding pci bus address
     """
-    pci_class_dic = {
-        "0104": "scsi_host",
-        "0c04": "fc_host",
-        "0200": "net",
-        "0108": "nvme",
-        "0280": "net",
-        "0207": "net",
-        "0c03": "usb",
-    }
     pci_class_id = get_pci_prop(pci_address, "Class")
-    if pci_class_id not in pci_class_dic:
+    try:
+        return _PCI_CLASS_NAMES[pci_class_id]
+    except KeyError:
         if pci_class_id is None:
             raise ValueError(
                 f"Unable to get 'Class' property of given pci " f"address {pci_address}"
-            )
+            ) from None
         raise ValueError(
             f"Class ID {pci_class_id} is not defined "
             f"in this library please send an update"
-        )
-    return pci_class_dic.get(pci_class_id)
+        ) from None
 
 
 def get_pci_fun_list(pci_address):
@@ -178,7 +406,14 @@ def get_pci_fun_list(pci_address):
 
     :return: list of functions in a PCI address.
     """
-    return list(dev for dev in get_pci_addresses() if pci_address in dev)
+    index = _PciCache.by_prefix()
+    if pci_address in index:
+        return list(index[pci_address])
+    return [
+        address
+        for address, props in _PciCache.get_all().items()
+        if pci_address in address and not props.get("Class", "").startswith("06")
+    ]
 
 
 def get_slot_from_sysfs(full_pci_address):
@@ -200,10 +435,10 @@ def get_slot_from_sysfs(full_pci_address):
     if not os.path.isfile(f"/proc/device-tree/{devspec}/ibm,loc-code"):
         return None
     slot = genio.read_file(f"/proc/device-tree/{devspec}/ibm,loc-code")
-    slot_ibm = re.match(r"((\w+)[.])+(\w+)-[PC(\d+)-]*C(\d+)", slot)
+    slot_ibm = _SLOT_IBM_RE.match(slot)
     if slot_ibm:
         return slot_ibm.group()
-    slot_openpower = re.match(r"(\w+)[\s]*(\w+)(\d*)", slot)
+    slot_openpower = _SLOT_OPENPOWER_RE.match(slot)
     if slot_openpower:
         return slot_openpower.group()
     raise ValueError(f"Failed to get slot from: '{slot}'")
@@ -217,7 +452,8 @@ def get_slot_list():
 
     :return: list of slots in the system.
     """
-    return list(set(get_slot_from_sysfs(dev) for dev in get_pci_addresses()))
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        return list(set(executor.map(get_slot_from_sysfs, get_pci_addresses())))
 
 
 def get_pci_id_from_sysfs(full_pci_address):
@@ -229,22 +465,20 @@ def get_pci_id_from_sysfs(full_pci_address):
     :return: PCI ID of a PCI address from sysfs.
     """
     path = f"/sys/bus/pci/devices/{full_pci_address}"
-    if os.path.isdir(path):
-        path = "%s/%%s" % path  # pylint: disable=C0209
-        return ":".join(
-            [
-                f"{int(open(path % param).read(), 16):04x}"  # pylint: disable=W1514
-                for param in [
-                    "vendor",
-                    "device",
-                    "subsystem_vendor",
-                    "subsystem_device",
-                ]
-            ]
-        )
-    return None
+    values = []
+    for param in ("vendor", "device", "subsystem_vendor", "subsystem_device"):
+        try:
+            fd = os.open(f"{path}/{param}", os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            values.append(f"{int(os.read(fd, 16), 16):04x}")
+        finally:
+            os.close(fd)
+    return ":".join(values)
 
 
+@functools.lru_cache(maxsize=4096)
 def get_pci_prop(pci_address, prop):
     """
     Gets specific PCI ID of given PCI address. (first match only)
@@ -255,12 +489,10 @@ def get_pci_prop(pci_address, prop):
     :return: specific PCI ID of a PCI address.
     :rtype: str
     """
-    cmd = f"lspci -Dnvmm -s {pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if output:
-        for line in output.splitlines():
-            if prop == line.split(":")[0]:
-                return line.split()[-1]
+    for address in _PciCache.matching_addresses(pci_address):
+        value = _PciCache.get_all()[address].get(prop)
+        if value is not None:
+            return value
     return None
 
 
@@ -272,15 +504,15 @@ def get_pci_id(pci_address):
 
     :return: PCI ID of a PCI address.
     """
-    pci_id = []
-    for params in ["Vendor", "Device", "SVendor", "SDevice"]:
-        output = get_pci_prop(pci_address, params)
-        if not output:
-            return None
-        pci_id.append(output)
-    if pci_id:
-        return ":".join(pci_id)
-    return None
+    pci_info = get_pci_info(pci_address)
+    if not pci_info:
+        return None
+    try:
+        return ":".join(
+            pci_info[prop] for prop in ("Vendor", "Device", "SVendor", "SDevice")
+        )
+    except KeyError:
+        return None
 
 
 def get_pci_info(pci_address):
@@ -292,17 +524,9 @@ def get_pci_info(pci_address):
     :return: Dictionary attribute name as key and attribute value as value.
     :rtype: Dict
     """
-    cmd = f"lspci -Dnvmm -s {pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    pci_info = {}
-    if not output:
-        return None
-    for line in output.splitlines():
-        if line.strip():
-            pci_info[line.split(":")[0].strip()] = (
-                ":".join(line.split(":")[1:])
-            ).strip()
-    return pci_info
+    for address in _PciCache.matching_addresses(pci_address):
+        return dict(_PciCache.get_all()[address])
+    return None
 
 
 def get_driver(pci_address):
@@ -314,10 +538,8 @@ def get_driver(pci_address):
     :return: driver of a PCI address.
     :rtype: str
     """
-    cmd = f"lspci -ks {pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if output:
-        for line in output.splitlines():
+    for address in _PciCache.matching_addresses(pci_address):
+        for line in _PciCache.get_verbose().get(address, []):
             if "Kernel driver in use:" in line:
                 return line.rsplit(None, 1)[-1]
     return None
@@ -331,14 +553,10 @@ def unbind(driver, full_pci_address):
     :param full_pci_address:  Full PCI address including domain (0000:03:00.0)
     :return: None
     """
-    genio.write_file_or_fail(f"/sys/bus/pci/drivers/{driver}/unbind", full_pci_address)
-    if wait.wait_for(
-        lambda: os.path.exists(
-            f"/sys/bus/pci/drivers/\
-{driver}/{full_pci_address}"
-        ),
-        timeout=5,
-    ):
+    driver_path = f"/sys/bus/pci/drivers/{driver}/{full_pci_address}"
+    _write_sysfs(f"/sys/bus/pci/drivers/{driver}/unbind", full_pci_address)
+    _PciCache.invalidate()
+    if not wait.wait_for(lambda: not os.path.exists(driver_path), timeout=5):
         raise ValueError(f"Not able to unbind {full_pci_address} from {driver}")
 
 
@@ -350,14 +568,10 @@ def bind(driver, full_pci_address):
     :param full_pci_address:  Full PCI address including domain (0000:03:00.0)
     :return: None
     """
-    genio.write_file_or_fail(f"/sys/bus/pci/drivers/{driver}/bind", full_pci_address)
-    if not wait.wait_for(
-        lambda: os.path.exists(
-            f"/sys/bus/pci/drivers/\
-{driver}/{full_pci_address}"
-        ),
-        timeout=5,
-    ):
+    driver_path = f"/sys/bus/pci/drivers/{driver}/{full_pci_address}"
+    _write_sysfs(f"/sys/bus/pci/drivers/{driver}/bind", full_pci_address)
+    _PciCache.invalidate()
+    if not wait.wait_for(lambda: os.path.exists(driver_path), timeout=5):
         raise ValueError(f"Not able to bind {full_pci_address} to {driver}")
 
 
@@ -369,11 +583,10 @@ def get_vendor_id(full_pci_address):
     :return: vendor id of PCI address
     :rtype: str
     """
-    cmd = f"lspci -n -s {full_pci_address}"
-    out = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if not out:
+    props = _PciCache.get_all().get(full_pci_address)
+    if not props or "Vendor" not in props or "Device" not in props:
         raise ValueError(f"Not able to get {full_pci_address} vendor id")
-    return out.split(" ")[2].strip()
+    return f"{props['Vendor']}:{props['Device']}"
 
 
 def reset_check(full_pci_address):
@@ -384,11 +597,7 @@ def reset_check(full_pci_address):
     :return: whether reset for "full_pci_address" is successful
     :rtype: bool
     """
-    cmd = f"lspci -vvs {full_pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if not output:
-        return False
-    return True
+    return os.path.exists(f"/sys/bus/pci/devices/{full_pci_address}")
 
 
 def rescan_check(full_pci_address):
@@ -399,11 +608,7 @@ def rescan_check(full_pci_address):
     :return: whether rescan for full_pci_address is successful
     :rtype: bool
     """
-    cmd = f"lspci -vvs {full_pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if not output:
-        return False
-    return True
+    return os.path.exists(f"/sys/bus/pci/devices/{full_pci_address}")
 
 
 def change_domain_check(dom, full_pci_address, def_dom):
@@ -435,8 +640,9 @@ def reset(full_pci_address):
     :param full_pci_address: Full PCI address including domain (0000:03:00.0)
     :return: None
     """
-    genio.write_file_or_fail(f"/sys/bus/pci/devices/{full_pci_address}/remove", "1")
-    if not wait.wait_for(lambda: reset_check(full_pci_address), timeout=5):
+    _write_sysfs(f"/sys/bus/pci/devices/{full_pci_address}/remove", "1")
+    _PciCache.invalidate()
+    if not wait.wait_for(lambda: reset_check(full_pci_address), timeout=5, step=0.1):
         raise ValueError(f"Unsuccessful to remove {full_pci_address}")
 
 
@@ -447,8 +653,9 @@ def rescan(full_pci_address):
     :param full_pci_address: Full PCI address including domain (0000:03:00.0)
     :return: None
     """
-    genio.write_file_or_fail("/sys/bus/pci/rescan", "1")
-    if not wait.wait_for(lambda: rescan_check(full_pci_address), timeout=5):
+    _write_sysfs("/sys/bus/pci/rescan", "1")
+    _PciCache.invalidate()
+    if not wait.wait_for(lambda: rescan_check(full_pci_address), timeout=5, step=0.1):
         raise ValueError(f"Unsuccessful to rescan for {full_pci_address}")
 
 
@@ -460,9 +667,7 @@ def get_iommu_group(full_pci_address):
     :return: iommu group of full_pci_address
     :rtype: string
     """
-    cmd = f"lspci -vvvv -s {full_pci_address}"
-    out = process.run(cmd, ignore_status=True, shell=True)
-    for line in out.stdout_text.split("\n"):
+    for line in _PciCache.get_verbose().get(full_pci_address, []):
         if "IOMMU group" in line:
             return line.strip().split(" ")[2]
     raise ValueError(f"{full_pci_address} group not found")
@@ -498,10 +703,8 @@ def get_memory_address(pci_address):
     :return: memory address of a pci_address.
     :rtype: str
     """
-    cmd = f"lspci -bv -s {pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if output:
-        for line in output.splitlines():
+    for address in _PciCache.matching_addresses(pci_address):
+        for line in _PciCache.get_bus_view().get(address, []):
             if "Memory at" in line:
                 return f"0x{line.split()[2]}"
     return None
@@ -519,19 +722,16 @@ def get_mask(pci_address):
     :return: mask of a PCI address.
     :rtype: str
     """
-    cmd = f"lspci -vv -s {pci_address}"
-    output = process.run(cmd, ignore_status=True, shell=True).stdout_text
-    if not output:
-        return None
-    dic = {"K": 1024, "M": 1048576, "G": 1073741824}
-    for line in output.splitlines():
-        if "Region" in line and "Memory at" in line:
-            val = line.split("=")[-1].split("]")[0]
-            memory_size = int(val[:-1]) * dic[val[-1]]
-            break
-    # int("0xffffffff", 16) = 4294967295
-    mask = hex((memory_size - 1) ^ 4294967295)
-    return mask
+    for address in _PciCache.matching_addresses(pci_address):
+        for line in _PciCache.get_verbose().get(address, []):
+            match = _REGION_MEM_RE.search(line)
+            if match is None:
+                continue
+            memory_size = int(match.group(1)) << _UNIT_SHIFTS[match.group(2)]
+            # BARs reaching beyond the 32 bit space need a 64 bit wide mask
+            mask_bits = 64 if memory_size >= (1 << 32) else 32
+            return hex((memory_size - 1) ^ ((1 << mask_bits) - 1))
+    return None
 
 
 def get_vpd(dom_pci_address):
@@ -553,17 +753,13 @@ def get_vpd(dom_pci_address):
     for line in vpd.splitlines():
         if len(line) < 5:
             continue
-        if "*YL" in line:
-            vpd_dic["slot"] = line[4:]
-        elif "*DS" in line:
-            vpd_dic["pci_id"] = line[4:]
-        elif "*FC" in line:
-            vpd_dic["feature_code"] = line[4:]
-        elif "*AX" in line:
+        tag = line[:4].strip()
+        key = _VPD_KEYS.get(tag)
+        if key is not None:
+            vpd_dic[key] = line[4:]
+        elif tag == "*AX":
             if not (dom_pci_address in line or vpd_dic["pci_id"].split()[0] in line):
                 dev_list.append(line[4:])
-        elif "*CD" in line:
-            vpd_dic["pci_id"] = line[4:]
     vpd_dic["devices"] = dev_list
     return vpd_dic
 
@@ -592,18 +788,15 @@ def get_cfg(dom_pci_address):
     for line in cfg.splitlines():
         if "Manufacturer Name" in line:
             cfg_dic["Mfg"] = line.split(".")[-1]
-        if "Machine Type-Model" in line:
+        elif "Machine Type-Model" in line:
             cfg_dic["Model"] = line.split(".")[-1]
-        if "Device Specific" in line:
+        elif "Device Specific" in line:
             cfg_dic["YC"] = line.split(".")[-1]
-        if "Location Code" in line:
+        elif "Location Code" in line:
             cfg_dic["YL"] = line.split("..")[-1].strip(".")
     if "Description" in cfg_dic:
-        pcid = re.search(
-            r"[0-9a-e]{4}\:[0-9a-e]{2}\:[0-9a-e]{2}\.[0-9a-e]{1}",
-            cfg_dic["Description"],
-        )
+        pcid = _PCI_ID_RE.search(cfg_dic["Description"])
         cfg_dic["pci_id"] = pcid.group()
-        device_subvendor = re.search(r"([0-9a-e]{8})", cfg_dic["Description"])
+        device_subvendor = _SUBVENDOR_RE.search(cfg_dic["Description"])
         cfg_dic["subvendor_device"] = device_subvendor.group()
     return cfg_dic
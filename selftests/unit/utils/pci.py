@@ -2,6 +2,37 @@ import unittest.mock
 
 from avocado.utils import pci
 
+LSPCI_DNVMM = """Slot:\t0000:00:01.0
+Class:\t0600
+Vendor:\t1014
+Device:\t04c1
+
+Slot:\t0001:01:00.0
+Class:\t0200
+Vendor:\t15b3
+Device:\t1019
+SVendor:\t15b3
+SDevice:\t0025
+
+Slot:\t0001:01:00.1
+Class:\t0200
+Vendor:\t15b3
+Device:\t1019
+SVendor:\t15b3
+SDevice:\t0025
+"""
+
+
+LSVPD_OUTPUT = """*VC 5.0
+*TM IBM,8247-22L
+*DS PCIe2 4-port 1GbE Adapter
+*YL U78CB.001.WZS07CU-P1-C9
+*FC 5899
+*AX eth0
+*AX eth1
+*CD 14e4:1657
+"""
+
 
 class UtilsPciTest(unittest.TestCase):
     def test_get_slot_from_sysfs(self):
@@ -35,6 +66,88 @@ class UtilsPciTest(unittest.TestCase):
                 ):
                     self.assertEqual(pci.get_slot_from_sysfs(pcid), exp)
 
+    def test_pci_cache_parse_machine(self):
+        devices = pci._PciCache._parse_machine(LSPCI_DNVMM.splitlines())
+        self.assertEqual(len(devices), 3)
+        self.assertEqual(devices["0000:00:01.0"]["Class"], "0600")
+        self.assertEqual(devices["0001:01:00.0"]["SDevice"], "0025")
+
+    def test_get_pci_addresses(self):
+        classes = {
+            "0000:00:01.0": "0x060400",
+            "0001:01:00.0": "0x020000",
+            "0001:01:00.1": "0x020000",
+        }
+        entries = []
+        for address in classes:
+            entry = unittest.mock.Mock(path=f"/sys/bus/pci/devices/{address}")
+            entry.name = address
+            entries.append(entry)
+        scandir = unittest.mock.MagicMock()
+        scandir.return_value.__enter__.return_value = iter(entries)
+        with unittest.mock.patch("os.scandir", scandir):
+            with unittest.mock.patch(
+                "avocado.utils.genio.read_file",
+                side_effect=lambda path: f"{classes[path.split('/')[-2]]}\n",
+            ):
+                self.assertEqual(
+                    pci.get_pci_addresses(), ["0001:01:00.0", "0001:01:00.1"]
+                )
+
+    def test_get_pci_fun_list(self):
+        devices = pci._PciCache._parse_machine(LSPCI_DNVMM.splitlines())
+        with unittest.mock.patch.object(pci._PciCache, "_machine", devices):
+            with unittest.mock.patch.object(pci._PciCache, "_fun_index", None):
+                self.assertEqual(
+                    pci.get_pci_fun_list("0001:01:00"),
+                    ["0001:01:00.0", "0001:01:00.1"],
+                )
+                self.assertEqual(pci.get_pci_fun_list("00.1"), ["0001:01:00.1"])
+
+    def test_get_pci_prop(self):
+        pci.get_pci_prop.cache_clear()
+        devices = pci._PciCache._parse_machine(LSPCI_DNVMM.splitlines())
+        with unittest.mock.patch.object(pci._PciCache, "_machine", devices):
+            self.assertEqual(pci.get_pci_prop("0001:01:00.1", "Vendor"), "15b3")
+            self.assertEqual(pci.get_pci_prop("0001:01", "Class"), "0200")
+            self.assertIsNone(pci.get_pci_prop("0001:01:00.1", "ProgIf"))
+
+    def test_get_pci_id(self):
+        devices = pci._PciCache._parse_machine(LSPCI_DNVMM.splitlines())
+        with unittest.mock.patch.object(pci._PciCache, "_machine", devices):
+            self.assertEqual(pci.get_pci_id("0001:01:00.0"), "15b3:1019:15b3:0025")
+            self.assertIsNone(pci.get_pci_id("0000:00:01.0"))
+            self.assertIsNone(pci.get_pci_id("0009:09:09.9"))
+
+    def test_get_mask(self):
+        devices = pci._PciCache._parse_machine(LSPCI_DNVMM.splitlines())
+        verbose = {
+            "0001:01:00.0": [
+                "0001:01:00.0 Ethernet controller: Mellanox ConnectX-5",
+                "\tRegion 0: Memory at 3fe080000000 (64-bit) [size=32M]",
+            ],
+            "0001:01:00.1": [
+                "0001:01:00.1 Ethernet controller: Mellanox ConnectX-5",
+                "\tRegion 0: Memory at 3fe100000000 (64-bit) [size=4G]",
+            ],
+        }
+        with unittest.mock.patch.object(pci._PciCache, "_machine", devices):
+            with unittest.mock.patch.object(pci._PciCache, "_verbose", verbose):
+                self.assertEqual(pci.get_mask("0001:01:00.0"), "0xfe000000")
+                self.assertEqual(pci.get_mask("0001:01:00.1"), "0xffffffff00000000")
+                self.assertIsNone(pci.get_mask("0000:00:01.0"))
+
+    def test_get_vpd(self):
+        run_result = unittest.mock.Mock(stdout_text=LSVPD_OUTPUT)
+        with unittest.mock.patch(
+            "avocado.utils.process.run", return_value=run_result
+        ):
+            vpd = pci.get_vpd("0001:01:00.0")
+        self.assertEqual(vpd["slot"], "U78CB.001.WZS07CU-P1-C9")
+        self.assertEqual(vpd["pci_id"], "14e4:1657")
+        self.assertEqual(vpd["feature_code"], "5899")
+        self.assertEqual(vpd["devices"], ["eth0", "eth1"])
+
     def test_get_slot_from_sysfs_negative(self):
         with unittest.mock.patch("os.path.isfile", return_value=True):
             with unittest.mock.patch(